@@ -1,8 +1,14 @@
 import datetime
-from unittest.mock import patch
+import os
+import re
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import orjson
 from streamlit.testing.v1 import AppTest
-from openai.types.chat import ChatCompletionMessage
+from openai.types.chat import ChatCompletionChunk, ChatCompletionMessage
 from openai.types.chat.chat_completion import ChatCompletion, Choice
+from openai.types.chat.chat_completion_chunk import Choice as ChunkChoice, ChoiceDelta
 
 
 # See https://github.com/openai/openai-python/issues/715#issuecomment-1809203346
@@ -25,6 +31,20 @@ def create_chat_completion(response: str, role: str = "assistant") -> ChatComple
     )
 
 
+def create_chat_completion_chunks(response: str, role: str = "assistant") -> list[ChatCompletionChunk]:
+    created = int(datetime.datetime.now().timestamp())
+    return [
+        ChatCompletionChunk(
+            id="foo",
+            model="gpt-3.5-turbo",
+            object="chat.completion.chunk",
+            choices=[ChunkChoice(index=0, delta=ChoiceDelta(content=token, role=role))],
+            created=created,
+        )
+        for token in re.findall(r"\s*\S+", response)
+    ]
+
+
 @patch("openai.resources.chat.Completions.create")
 def test_Chatbot(openai_create):
     at = AppTest.from_file("Chatbot.py").run()
@@ -54,3 +74,75 @@ def test_Langchain_Quickstart(langchain_llm):
     at.button[0].set_value(True).run()
     print(at)
     assert at.info[0].value == RESPONSE
+
+
+@patch("openai.resources.chat.Completions.create")
+def test_Chat_with_user_feedback(openai_create):
+    at = AppTest.from_file("pages/5_Chat_with_user_feedback.py").run()
+    assert not at.exception
+
+    JOKE = "Why did the shark cross the reef? To get to the other tide."
+    openai_create.return_value = iter(create_chat_completion_chunks(JOKE))
+    at.text_input(key="feedback_api_key").set_value("sk-...")
+    at.chat_input[0].set_value("Tell me a joke about sharks").run()
+    assert openai_create.call_args.kwargs["stream"] is True
+    sent = openai_create.call_args.kwargs["messages"]
+    assert sent[0]["role"] == "system"
+    assert [m["content"] for m in sent[1:]] == ["Tell me a joke about sharks"]
+    assert at.chat_message[2].markdown[0].value == JOKE
+    assert at.session_state["response"] == JOKE
+    assert not at.exception
+
+
+def run_lab_insights_genomic(analysis: dict, openai_create) -> AppTest:
+    """Run the Lab Insights genomic page against a mocked analysis API response"""
+    payload = orjson.dumps(analysis)
+    # Distinct bytes per call so the cached genomic analysis is not shared between tests
+    upload = SimpleNamespace(name="sample.vcf", getvalue=lambda: payload)
+    response = MagicMock(content=payload)
+    openai_create.side_effect = lambda **kwargs: iter(create_chat_completion_chunks("Actionable."))
+    with (
+        patch.dict(os.environ, {"OPENAI_API_KEY": "sk-..."}),
+        patch("streamlit.file_uploader", return_value=upload),
+        patch("requests.Session.post", return_value=response),
+    ):
+        return AppTest.from_file("pages/Lab Insights", default_timeout=30).run()
+
+
+@patch("openai.resources.chat.Completions.create")
+def test_Lab_Insights_mixed_cosmic_context(openai_create):
+    analysis = {
+        "mutations": [{"gene": "TP53"}],
+        "cosmic_context": [
+            {"gene": "TP53", "freq": 0.5, "sites": ["lung"]},
+            {"gene": "KRAS", "freq": "N/A", "sites": "colon"},
+        ],
+    }
+    at = run_lab_insights_genomic(analysis, openai_create)
+    assert not at.exception
+    assert not at.error
+    assert len(at.dataframe) == 1
+    assert openai_create.called
+
+
+@patch("openai.resources.chat.Completions.create")
+def test_Lab_Insights_clips_long_analysis(openai_create):
+    mutations = [{"gene": f"GENE{i}", "variant": "c.1A>G", "note": "x" * 200} for i in range(500)]
+    at = run_lab_insights_genomic({"mutations": mutations, "cosmic_context": []}, openai_create)
+    assert not at.exception
+    findings = orjson.loads(openai_create.call_args.kwargs["messages"][1]["content"])
+    kept = findings["mutations"]
+    assert kept[0]["gene"] == "GENE0" and kept[-1]["gene"] == "GENE499"
+    assert findings["omitted_mutations"] == len(mutations) - len(kept) > 0
+
+
+@patch("openai.resources.chat.Completions.create")
+def test_Lab_Insights_clips_cosmic_context_first(openai_create):
+    mutations = [{"gene": f"GENE{i}", "variant": "c.1A>G"} for i in range(200)]
+    cosmic_context = [{"gene": f"GENE{i}", "note": "x" * 1000} for i in range(100)]
+    at = run_lab_insights_genomic({"mutations": mutations, "cosmic_context": cosmic_context}, openai_create)
+    assert not at.exception
+    findings = orjson.loads(openai_create.call_args.kwargs["messages"][1]["content"])
+    assert findings["mutations"] == mutations
+    assert "omitted_mutations" not in findings
+    assert findings["omitted_cosmic_context"] > 0
@@ -1,8 +1,54 @@
 import streamlit as st
-from langchain.agents import initialize_agent, AgentType
-from langchain.callbacks import StreamlitCallbackHandler
-from langchain.chat_models import ChatOpenAI
-from langchain.tools import DuckDuckGoSearchRun
+
+SIDEBAR_LINKS_MD = (
+    "[Get an OpenAI API key](https://platform.openai.com/account/api-keys)\n\n"
+    "[View the source code](https://github.com/streamlit/llm-examples/blob/main/pages/2_Chat_with_search.py)\n\n"
+    "[![Open in GitHub Codespaces](https://github.com/codespaces/badge.svg)](https://codespaces.new/streamlit/llm-examples?quickstart=1)"
+)
+
+# Most recent messages passed to the agent each turn, so prompt size stays bounded
+MAX_HISTORY_MESSAGES = 10
+
+SEARCH_DESCRIPTION = (
+    "A wrapper around DuckDuckGo Search. Useful for when you need to answer questions "
+    "about current events. Input should be a search query."
+)
+
+
+# -- One DuckDuckGo tool (and HTTP session) per process
+@st.cache_resource
+def get_web_search():
+    from langchain.tools import DuckDuckGoSearchRun
+
+    return DuckDuckGoSearchRun()
+
+
+# -- Web search memoized so repeated agent sub-queries skip the DuckDuckGo round-trip
+@st.cache_data(ttl=1800, max_entries=512, show_spinner=False)
+def cached_search(query):
+    return get_web_search().run(query)
+
+
+# -- Agent built once per API key instead of on every message
+@st.cache_resource
+def get_search_agent(api_key):
+    from langchain.agents import AgentType, initialize_agent
+    from langchain.chat_models import ChatOpenAI
+    from langchain.tools import Tool
+
+    llm = ChatOpenAI(
+        model_name="gpt-3.5-turbo",
+        openai_api_key=api_key,
+        streaming=True
+    )
+    search = Tool(name="Search", func=cached_search, description=SEARCH_DESCRIPTION)
+    return initialize_agent(
+        [search],
+        llm,
+        agent=AgentType.ZERO_SHOT_REACT_DESCRIPTION,
+        handle_parsing_errors=True
+    )
+
 
 # -- Sidebar for API key entry
 with st.sidebar:
@@ -11,9 +57,7 @@ with st.sidebar:
         key="agile_ai_api_key_openai", 
         type="password"
     )
-    "[Get an OpenAI API key](https://platform.openai.com/account/api-keys)"
-    "[View the source code](https://github.com/streamlit/llm-examples/blob/main/pages/2_Chat_with_search.py)"
-    "[![Open in GitHub Codespaces](https://github.com/codespaces/badge.svg)](https://codespaces.new/streamlit/llm-examples?quickstart=1)"
+    st.markdown(SIDEBAR_LINKS_MD)
 
 # -- App Title
 st.title("🤖 AGILE AI - Chat with Search")
@@ -48,23 +92,15 @@ if user_input:
         st.info("Please enter your OpenAI API key to proceed.")
         st.stop()
 
-    # -- LLM and Agent setup
-    llm = ChatOpenAI(
-        model_name="gpt-3.5-turbo", 
-        openai_api_key=openai_api_key, 
-        streaming=True
-    )
-    search = DuckDuckGoSearchRun(name="Search")
-    search_agent = initialize_agent(
-        [search], 
-        llm, 
-        agent=AgentType.ZERO_SHOT_REACT_DESCRIPTION, 
-        handle_parsing_errors=True
-    )
+    # -- LLM and Agent setup (LangChain is only imported once a prompt arrives)
+    from langchain.callbacks import StreamlitCallbackHandler
+
+    search_agent = get_search_agent(openai_api_key)
 
     # -- Streamlit callback handler for real-time LLM outputs
     with st.chat_message("assistant"):
         st_cb = StreamlitCallbackHandler(st.container(), expand_new_thoughts=False)
-        response = search_agent.run(st.session_state.messages, callbacks=[st_cb])
+        recent_messages = st.session_state.messages[-MAX_HISTORY_MESSAGES:]
+        response = search_agent.run(recent_messages, callbacks=[st_cb])
         st.session_state.messages.append({"role": "assistant", "content": response})
         st.write(response)
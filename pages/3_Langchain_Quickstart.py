@@ -8,8 +8,13 @@ with st.sidebar:
     "[Get an OpenAI API key](https://platform.openai.com/account/api-keys)"
 
 
+@st.cache_resource
+def get_llm(api_key):
+    return OpenAI(temperature=0.7, openai_api_key=api_key)
+
+
 def generate_response(input_text):
-    llm = OpenAI(temperature=0.7, openai_api_key=openai_api_key)
+    llm = get_llm(openai_api_key)
     st.info(llm(input_text))
 
 
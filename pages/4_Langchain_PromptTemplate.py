@@ -1,5 +1,5 @@
 import streamlit as st
-from langchain.llms import OpenAI
+from langchain.chat_models import ChatOpenAI
 from langchain.prompts import PromptTemplate
 
 st.title("🦜🔗 Langchain - Blog Outline Generator App")
@@ -7,17 +7,20 @@ st.title("🦜🔗 Langchain - Blog Outline Generator App")
 openai_api_key = st.sidebar.text_input("OpenAI API Key", type="password")
 
 
+@st.cache_resource
+def get_llm(api_key):
+    return ChatOpenAI(model_name="gpt-3.5-turbo", openai_api_key=api_key)
+
+
 def blog_outline(topic):
-    # Instantiate LLM model
-    llm = OpenAI(model_name="text-davinci-003", openai_api_key=openai_api_key)
+    # Reuse the LLM model for this key across reruns
+    llm = get_llm(openai_api_key)
     # Prompt
     template = "As an experienced data scientist and technical writer, generate an outline for a blog about {topic}."
     prompt = PromptTemplate(input_variables=["topic"], template=template)
     prompt_query = prompt.format(topic=topic)
-    # Run LLM model
-    response = llm(prompt_query)
-    # Print results
-    return st.info(response)
+    # Run LLM model, rendering tokens as they arrive
+    return st.write_stream(llm.stream(prompt_query))
 
 
 with st.form("myform"):
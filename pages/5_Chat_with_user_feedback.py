@@ -1,13 +1,21 @@
 from openai import OpenAI
 import streamlit as st
 from streamlit_feedback import streamlit_feedback
-import trubrics
+
+MAX_CONTEXT_TURNS = 10
+MAX_CONTEXT_CHARS = 12000
+# Sent in place of the UI greeting so the model context starts with a fixed prefix
+SYSTEM_MESSAGE = {"role": "system", "content": "You are a helpful, concise assistant."}
+
+SIDEBAR_LINKS_MD = (
+    "[Get an OpenAI API key](https://platform.openai.com/account/api-keys)\n\n"
+    "[View the source code](https://github.com/streamlit/llm-examples/blob/main/pages/5_Chat_with_user_feedback.py)\n\n"
+    "[![Open in GitHub Codespaces](https://github.com/codespaces/badge.svg)](https://codespaces.new/streamlit/llm-examples?quickstart=1)"
+)
 
 with st.sidebar:
     openai_api_key = st.text_input("OpenAI API Key", key="feedback_api_key", type="password")
-    "[Get an OpenAI API key](https://platform.openai.com/account/api-keys)"
-    "[View the source code](https://github.com/streamlit/llm-examples/blob/main/pages/5_Chat_with_user_feedback.py)"
-    "[![Open in GitHub Codespaces](https://github.com/codespaces/badge.svg)](https://codespaces.new/streamlit/llm-examples?quickstart=1)"
+    st.markdown(SIDEBAR_LINKS_MD)
 
 st.title("📝 Chat with feedback (Trubrics)")
 
@@ -16,6 +24,13 @@ In this example, we're using [streamlit-feedback](https://github.com/trubrics/st
 from the user about the LLM responses.
 """
 
+
+@st.cache_resource
+def get_openai_client(api_key):
+    # One client (and connection pool) per key, reused across reruns
+    return OpenAI(api_key=api_key, timeout=30.0)
+
+
 if "messages" not in st.session_state:
     st.session_state.messages = [
         {"role": "assistant", "content": "How can I help you? Leave feedback to help me improve!"}
@@ -34,12 +49,19 @@ if prompt := st.chat_input(placeholder="Tell me a joke about sharks"):
     if not openai_api_key:
         st.info("Please add your OpenAI API key to continue.")
         st.stop()
-    client = OpenAI(api_key=openai_api_key)
-    response = client.chat.completions.create(model="gpt-3.5-turbo", messages=messages)
-    st.session_state["response"] = response.choices[0].message.content
+    client = get_openai_client(openai_api_key)
+    # Send the system prompt plus the most recent exchanges, dropping the oldest ones
+    # until the prompt fits the budget (~4 characters per token)
+    recent = messages[1:][-2 * MAX_CONTEXT_TURNS :]
+    while len(recent) > 1 and sum(len(msg["content"]) for msg in recent) > MAX_CONTEXT_CHARS:
+        recent.pop(0)
+    context = [SYSTEM_MESSAGE] + recent
+    stream = client.chat.completions.create(model="gpt-3.5-turbo", messages=context, stream=True)
     with st.chat_message("assistant"):
-        messages.append({"role": "assistant", "content": st.session_state["response"]})
-        st.write(st.session_state["response"])
+        st.session_state["response"] = st.write_stream(
+            chunk.choices[0].delta.content or "" for chunk in stream if chunk.choices
+        )
+    messages.append({"role": "assistant", "content": st.session_state["response"]})
 
 if st.session_state["response"]:
     feedback = streamlit_feedback(
@@ -51,6 +73,8 @@ if st.session_state["response"]:
     # The return value of streamlit_feedback() is just a dict.
     # Configure your own account at https://trubrics.streamlit.app/
     if feedback and "TRUBRICS_EMAIL" in st.secrets:
+        import trubrics
+
         config = trubrics.init(
             email=st.secrets.TRUBRICS_EMAIL,
             password=st.secrets.TRUBRICS_PASSWORD,
@@ -1,5 +1,4 @@
 import streamlit as st
-import os
 from modules.digital_twins import generate_digital_twin
 from modules.tumor_evolution import predict_tumor_evolution
 from modules.crispr_ai import analyze_crispr_feasibility